@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 
 import rich.logging
 import uvicorn
@@ -32,18 +34,29 @@ console_handler = rich.logging.RichHandler(level=logging.INFO)
 console_formatter = logging.Formatter("%(message)s")
 console_handler.setFormatter(console_formatter)
 
+# Handlers run on the listener thread, so request paths only pay for an enqueue.
+log_queue: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
 logging.basicConfig(
     level=logging.DEBUG,
-    handlers=[file_handler, console_handler],
+    handlers=[queue_handler],
 )
 
+LOOP = "asyncio"
+
 if os.name == "nt":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 else:
     try:
-        import uvloop
+        import uvloop  # noqa: F401
 
-        uvloop.install()
+        LOOP = "uvloop"
     except ImportError:
         pass
 
@@ -52,9 +65,9 @@ def runner(*, host: str = HOST, port: int = PORT) -> None:
     development_mode = os.getenv("DEVELOPMENT_MODE", "false").lower() == "true"
     if development_mode:
         logging.info("Running in development mode with auto-reload enabled.")
-        uvicorn.run("src.app:app", host=host, port=port, reload=True)
+        uvicorn.run("src.app:app", host=host, port=port, loop=LOOP, reload=True)
     else:
-        uvicorn.run("src.app:app", host=host, port=port)
+        uvicorn.run("src.app:app", host=host, port=port, loop=LOOP)
 
 
 if __name__ == "__main__":
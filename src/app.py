@@ -4,6 +4,7 @@ import os
 from pathlib import Path
 
 import arrow
+import httpx
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -83,6 +84,8 @@ redis_client = Redis(
     protocol=3,
 )
 
+http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=100, keepalive_expiry=75))
+
 mongo_client = AsyncMongoClient(MONGODB_URI, tz_aware=True)
 email_normalizer = EmailNormalizer()
 
@@ -91,6 +94,7 @@ app.state.google_api_handler = google_api_handler
 app.state.s3 = s3
 app.state.rng = rng
 app.state.redis_client = redis_client
+app.state.http_client = http_client
 app.state.email_normalizer = email_normalizer
 app.state.start_time = arrow.utcnow()
 
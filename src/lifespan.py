@@ -1,19 +1,64 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
+import httpx
+import pymongo
 from fastapi import FastAPI
+from pymongo.asynchronous.database import AsyncDatabase as Database
 from pymongo.asynchronous.mongo_client import AsyncMongoClient
 from redis.asyncio import Redis
 
+from src.utils import S3, GoogleAPIHandler, TokenManager
+
+logger = logging.getLogger(__name__)
+
+
+async def _ensure_indexes(database: Database) -> None:
+    """Back the per-user, per-day lookups made by the AI routes with compound indexes."""
+    try:
+        await asyncio.gather(
+            database["plans"].create_index([("user_id", pymongo.ASCENDING), ("created_at_timestamp", pymongo.ASCENDING)]),
+            database["tips"].create_index([("user_id", pymongo.ASCENDING), ("created_at_timestamp", pymongo.ASCENDING)]),
+            database["user_exercises"].create_index([("user_id", pymongo.ASCENDING), ("added_at_timestamp", pymongo.ASCENDING)]),
+        )
+    except Exception as exc:
+        logger.exception("Failed to ensure MongoDB indexes", exc_info=exc)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    index_task: asyncio.Task[None] | None = None
+    if hasattr(app.state, "mongo_database"):
+        # Run in the background so a slow or unreachable MongoDB does not hold up serving
+        index_task = asyncio.create_task(_ensure_indexes(app.state.mongo_database))
+
     try:
         yield
     finally:
+        if index_task is not None:
+            index_task.cancel()
+
         if hasattr(app.state, "redis_client"):
             redis_client: Redis = app.state.redis_client
             await redis_client.close()
 
+        if hasattr(app.state, "auth_manager"):
+            auth_manager: TokenManager = app.state.auth_manager
+            await auth_manager.redis_client.close()
+
         if hasattr(app.state, "mongo_client"):
             mongo_client: AsyncMongoClient = app.state.mongo_client
             await mongo_client.close()
+
+        if hasattr(app.state, "http_client"):
+            http_client: httpx.AsyncClient = app.state.http_client
+            await http_client.aclose()
+
+        if hasattr(app.state, "google_api_handler"):
+            google_api_handler: GoogleAPIHandler = app.state.google_api_handler
+            await google_api_handler.close()
+
+        if hasattr(app.state, "s3"):
+            s3: S3 = app.state.s3
+            await s3.close()
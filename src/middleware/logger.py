@@ -24,11 +24,12 @@ class ConsoleLoggingMiddleware:
         self._setup_uvicorn_logging()
 
     # Color mappings for status codes and HTTP methods
+    # Keyed by status class (status_code // 100)
     _STATUS_COLORS = {
-        range(200, 300): Fore.BLACK + colorama.Back.GREEN,
-        range(300, 400): Fore.BLACK + colorama.Back.YELLOW,
-        range(400, 500): Fore.WHITE + colorama.Back.RED,
-        range(500, 600): Fore.WHITE + colorama.Back.MAGENTA,
+        2: Fore.BLACK + colorama.Back.GREEN,
+        3: Fore.BLACK + colorama.Back.YELLOW,
+        4: Fore.WHITE + colorama.Back.RED,
+        5: Fore.WHITE + colorama.Back.MAGENTA,
     }
 
     _METHOD_COLORS = {
@@ -102,10 +103,7 @@ class ConsoleLoggingMiddleware:
 
     def _get_status_color(self, status_code: int) -> str:
         """Return background color for status code."""
-        for status_range, color in self._STATUS_COLORS.items():
-            if status_code in status_range:
-                return color
-        return self._DEFAULT_COLOR
+        return self._STATUS_COLORS.get(status_code // 100, self._DEFAULT_COLOR)
 
     def _get_method_color(self, method: str) -> str:
         return self._METHOD_COLORS.get(method, self._DEFAULT_COLOR)
@@ -61,7 +61,7 @@ def get_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)):
 
 def get_access_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        return auth_manager.decode(credentials.credentials, "access")
+        return auth_manager.decode_access(credentials.credentials)
     except AuthError:
         raise HTTPException(
             status_code=401,
@@ -72,7 +72,7 @@ def get_access_token(credentials: HTTPAuthorizationCredentials = Depends(securit
 
 def get_refresh_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        return auth_manager.decode(credentials.credentials, "refresh")
+        return auth_manager.decode_refresh(credentials.credentials)
     except AuthError:
         raise HTTPException(
             status_code=401,
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 import uuid
 from typing import Any, Awaitable, Callable, ParamSpec, TypedDict, TypeVar, cast
 
@@ -75,15 +76,26 @@ class DailyInsightDict(TypedDict):
     created_at_timestamp: float
 
 
+_today_windows: dict[str, tuple[float, float]] = {}
+
+
 def _today_window(tz: str = "Asia/Kolkata", /) -> tuple[float, float]:
-    """Return start/end float timestamps for the current day in the given timezone."""
+    """Return start/end float timestamps for the current day in the given timezone.
+
+    The window is cached per timezone and recomputed once the current time falls outside it.
+    """
+    window = _today_windows.get(tz)
+    if window is not None and window[0] <= time.time() <= window[1]:
+        return window
+
     now = arrow.now(tz)
     start_of_the_day = now.floor("day")
     end_of_the_day = now.ceil("day")
-    return (
+    window = _today_windows[tz] = (
         start_of_the_day.float_timestamp,
         end_of_the_day.float_timestamp,
     )
+    return window
 
 
 def _timezone_for_user(user: UserDict) -> str:
@@ -117,8 +129,10 @@ async def _long_poll(fetch_existing: Callable[[], Awaitable[Any]], *, timeout_se
 
 
 async def _get_verified_user(user_id: str) -> UserDict:
-    cred = await credentials_collection.find_one({"_id": user_id})
-    user = await users_collection.find_one({"_id": user_id})
+    cred, user = await asyncio.gather(
+        credentials_collection.find_one({"_id": user_id}),
+        users_collection.find_one({"_id": user_id}),
+    )
 
     if not cred:
         raise HTTPException(HTTP_404_NOT_FOUND, detail="User credentials not found.")
@@ -186,8 +200,10 @@ async def _load_available_foods(user: UserDict) -> list[dict[str, Any]]:
     if dietary_preferences:
         pipeline.append({"$match": {"type": {"$in": dietary_preferences}}})
 
+    pipeline.append({"$project": {"_id": 1, "name": 1}})
+
     foods_cursor = await foods_collection.aggregate(pipeline)
-    return [{"_id": food.get("_id"), "name": food.get("name")} async for food in foods_cursor]
+    return await foods_cursor.to_list(length=None)
 
 
 async def _generate_and_store_plan(user: UserDict, user_id: str, available_foods: list[dict[str, Any]], lock_key: str):
@@ -331,7 +347,7 @@ async def _generate_and_store_exercises(user: UserDict, user_id: str, lock_key:
 
         for exercise in ai_response.exercises:
             name = exercise.name.lower().strip().replace(" ", "_").replace("'", "")
-            exercise.image_name_uri = await s3.get_presigned_url(f"ExerciseImages/{name}.png")
+            exercise.image_name_uri = s3.get_presigned_url(f"ExerciseImages/{name}.png")
 
             payload.append(
                 UserExerciseDict(
@@ -361,6 +377,10 @@ async def _find_tip_for_today(user: UserDict):
     )
 
 
+def _tip_payload(tip: DailyInsightDict) -> dict[str, str]:
+    return {"todays_focus": tip["todays_focus"], "daily_tip": tip["daily_tip"]}
+
+
 async def _generate_and_store_tip(user: UserDict, user_id: str, lock_key: str):
     try:
         if await _find_tip_for_today(user):
@@ -481,7 +501,7 @@ async def get_tips(user_id: str = Depends(get_user_id, use_cache=False)):
 
     tip = await _find_tip_for_today(user)
     if tip:
-        return JSONResponse(DailyInsightModel(daily_tip=tip["daily_tip"], todays_focus=tip["todays_focus"]).model_dump(by_alias=True))
+        return JSONResponse(_tip_payload(tip))
 
     lock_key = _daily_lock_key("tips", user)
     if await _acquire_task_lock(lock_key):
@@ -494,9 +514,7 @@ async def get_tips(user_id: str = Depends(get_user_id, use_cache=False)):
     )
 
     if polled_tip:
-        return JSONResponse(
-            DailyInsightModel(daily_tip=polled_tip["daily_tip"], todays_focus=polled_tip["todays_focus"]).model_dump(by_alias=True)
-        )
+        return JSONResponse(_tip_payload(polled_tip))
 
     return JSONResponse(
         {
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 from typing import ParamSpec, TypedDict, TypeVar
 
-import arrow
 from fastapi import APIRouter, Body, Depends
 from fastapi.exceptions import HTTPException
 from fastapi.responses import ORJSONResponse as JSONResponse
@@ -31,7 +31,7 @@ from src.models import (
     UserExerciseModel,
 )
 from src.routes.api.utils import get_user_id
-from src.utils import S3, DailyInsightModel, GoogleAPIHandler
+from src.utils import S3, GoogleAPIHandler
 
 from ..objects import ErrorResponseModel, TimestampRange
 
@@ -63,25 +63,16 @@ class DailyInsightDict(TypedDict):
     created_at_timestamp: float
 
 
-def _today_window(tz: str = "Asia/Kolkata", /) -> tuple[float, float]:
-    """Return start/end float timestamps for the current day in the given timezone."""
-    now = arrow.now(tz)
-    start_of_the_day = now.floor("day")
-    end_of_the_day = now.ceil("day")
-    return (
-        start_of_the_day.float_timestamp,
-        end_of_the_day.float_timestamp,
-    )
-
-
 async def _get_verified_user(user_id: str) -> UserDict:
     """Fetch user + credentials ensuring the account is active and email verified.
 
     Raises HTTPException with codes 404 (missing credentials), 410 (deleted),
     403 (locked or unverified), or 423 (user document missing).
     """
-    cred = await credentials_collection.find_one({"_id": user_id})
-    user = await users_collection.find_one({"_id": user_id})
+    cred, user = await asyncio.gather(
+        credentials_collection.find_one({"_id": user_id}),
+        users_collection.find_one({"_id": user_id}),
+    )
 
     if not cred:
         raise HTTPException(HTTP_404_NOT_FOUND, detail="User credentials not found.")
@@ -144,13 +135,12 @@ async def fetch_all_tips(
                 "$gte": timestamp_range.start_timestamp,
                 "$lte": timestamp_range.end_timestamp,
             },
-        }
+        },
+        projection={"_id": 0, "todays_focus": 1, "daily_tip": 1},
     )
 
     tips = await cursor.to_list(length=None)
-    return JSONResponse(
-        [DailyInsightModel(todays_focus=tip["todays_focus"], daily_tip=tip["daily_tip"]).model_dump(by_alias=True) for tip in tips]
-    )
+    return JSONResponse(tips)
 
 
 @router.post(
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
+import os
 import uuid
 
 import arrow
@@ -52,16 +54,24 @@ users_collection: Collection[UserDict] = database["users"]
 
 email_handler = EmailHandler()
 
+_bcrypt_rounds = os.getenv("BCRYPT_ROUNDS") or "12"
+# bcrypt.gensalt only accepts 4..31; fail at startup rather than on the first signup or login.
+if not _bcrypt_rounds.isdecimal() or not 4 <= int(_bcrypt_rounds) <= 31:
+    raise ValueError(f"Invalid BCRYPT_ROUNDS {_bcrypt_rounds!r}, expected an integer between 4 and 31")
 
-def _hash_password(password: str, /, *, algorithm: PasswordAlgorithm = PasswordAlgorithm.BCRYPT) -> str:
+BCRYPT_ROUNDS = int(_bcrypt_rounds)
+
+
+async def _hash_password(password: str, /, *, algorithm: PasswordAlgorithm = PasswordAlgorithm.BCRYPT) -> str:
     if algorithm == PasswordAlgorithm.BCRYPT:
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        hashed = await asyncio.to_thread(bcrypt.hashpw, password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+        return hashed.decode()
 
     raise ValueError("Unsupported password algorithm")
 
 
-def _verify_password(*, password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+async def _verify_password(*, password: str, hashed: str) -> bool:
+    return await asyncio.to_thread(bcrypt.checkpw, password.encode(), hashed.encode())
 
 
 async def _get_credential_by_email(email_address: str, /) -> CredentialsDict:
@@ -144,7 +154,7 @@ async def register(data: CredentialsModel = Body(...)):
         email_address=data.email_address,
         email_address_normalized=normalization_result.cleaned_email,
         email_address_provider=normalization_result.mailbox_provider,
-        password_hash=_hash_password(data.password),
+        password_hash=await _hash_password(data.password),
         password_algo=PasswordAlgorithm.BCRYPT,
         created_at_timestamp=now,
         updated_at_timestamp=now,
@@ -203,7 +213,7 @@ async def login(data: CredentialsModel = Body(...)):
 
     now = arrow.utcnow().timestamp()
 
-    if not _verify_password(password=data.password, hashed=cred.get("password_hash") or _hash_password("")):
+    if not await _verify_password(password=data.password, hashed=cred.get("password_hash") or await _hash_password("")):
         await credentials_collection.update_one(
             {"_id": cred.get("_id")},
             {
@@ -514,14 +524,14 @@ async def change_password(
 ):
     cred = await _get_credential_by_id(user_id)
 
-    if not _verify_password(password=current_password, hashed=cred.get("password_hash") or _hash_password("")):
+    if not await _verify_password(password=current_password, hashed=cred.get("password_hash") or await _hash_password("")):
         raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Current password is incorrect.")
 
     await credentials_collection.update_one(
         {"_id": user_id},
         {
             "$set": {
-                "password_hash": _hash_password(new_password),
+                "password_hash": await _hash_password(new_password),
                 "password_algo": PasswordAlgorithm.BCRYPT,
                 "updated_at_timestamp": arrow.utcnow().timestamp(),
             },
@@ -757,7 +767,7 @@ async def reset_password(
         {"_id": user_id},
         {
             "$set": {
-                "password_hash": _hash_password(new_password),
+                "password_hash": await _hash_password(new_password),
                 "password_algo": PasswordAlgorithm.BCRYPT,
                 "updated_at_timestamp": arrow.utcnow().timestamp(),
             },
@@ -82,16 +82,16 @@ async def _autocomplete_search(
     )
 
 
-async def _hydrate_song(song: SongDict) -> SongModel:
-    song["song_image_uri"] = await s3.get_presigned_url(f"Songs/{song['mood']}/{song['playlist']}/Image/{song['image_name']}")
-    song["playlist_image_uri"] = await s3.get_presigned_url(f"Songs/{song['mood']}/{song['playlist']}/{song['playlist'].lower()}.jpg")
+def _hydrate_song(song: SongDict) -> SongModel:
+    song["song_image_uri"] = s3.get_presigned_url(f"Songs/{song['mood']}/{song['playlist']}/Image/{song['image_name']}")
+    song["playlist_image_uri"] = s3.get_presigned_url(f"Songs/{song['mood']}/{song['playlist']}/{song['playlist'].lower()}.jpg")
     return SongModel(**song)  # type: ignore
 
 
-async def _hydrate_exercise(exercise: dict) -> ExerciseModel:
+def _hydrate_exercise(exercise: dict) -> ExerciseModel:
     model = ExerciseModel(**exercise)
     name = model.name.lower().strip().replace(" ", "_").replace("'", "")
-    model.image_name_uri = await s3.get_presigned_url(f"ExerciseImages/{name}.png")
+    model.image_name_uri = s3.get_presigned_url(f"ExerciseImages/{name}.png")
     return model
 
 
@@ -114,7 +114,7 @@ async def _search_exercise(exercise_name: str, limit: int):
         limit=limit,
     )
     async for exercise in cursor:
-        yield (await _hydrate_exercise(exercise)).model_dump_json(by_alias=True) + "\n"
+        yield _hydrate_exercise(exercise).model_dump_json(by_alias=True) + "\n"
 
 
 async def _search_song(text: str):
@@ -129,7 +129,7 @@ async def _search_song(text: str):
         }
     )
     async for song in cursor:
-        yield (await _hydrate_song(song)).model_dump_json(by_alias=True) + "\n"
+        yield _hydrate_song(song).model_dump_json(by_alias=True) + "\n"
 
 
 @router.get(
@@ -220,7 +220,7 @@ async def get_songs(
     if playlist:
         query["playlist"] = playlist
 
-    return [await _hydrate_song(song) for song in await songs_collection.find(query).to_list()]
+    return [_hydrate_song(song) for song in await songs_collection.find(query).to_list()]
 
 
 @router.get(
@@ -245,7 +245,7 @@ async def get_song(
     ),
 ):
     song = await _get_or_404(songs_collection, song_id, "Song")
-    return await _hydrate_song(song)
+    return _hydrate_song(song)
 
 
 @router.get(
@@ -270,7 +270,7 @@ async def stream_song(
     ),
 ):
     song = await _get_or_404(songs_collection, song_id, "Song")
-    uri = await s3.get_presigned_url(f"Songs/{song['mood']}/{song['playlist']}/Song/{song['song_name']}")
+    uri = s3.get_presigned_url(f"Songs/{song['mood']}/{song['playlist']}/Song/{song['song_name']}")
     return ServerMessage(detail=uri)
 
 
@@ -299,7 +299,7 @@ async def get_exercise(
     ),
 ):
     exercise = await _get_or_404(exercises_collection, exercise_id, "Exercise")
-    return await _hydrate_exercise(exercise)
+    return _hydrate_exercise(exercise)
 
 
 @router.get(
@@ -327,7 +327,7 @@ async def stream_exercise(
     ),
 ):
     exercise = await _get_or_404(exercises_collection, exercise_id, "Exercise")
-    uri = await s3.get_presigned_url(f"Exercises/{exercise['name'].lower().replace(' ', '_')}.mp4")
+    uri = s3.get_presigned_url(f"Exercises/{exercise['name'].lower().replace(' ', '_')}.mp4")
     return ServerMessage(detail=uri)
 
 
@@ -356,7 +356,7 @@ async def get_food(
     ),
 ):
     food = await _get_or_404(foods_collection, food_id, "Food item")
-    uri = await s3.get_presigned_url(f"FoodImages/{food['name'].lower().replace(' ', '_')}.png")
+    uri = s3.get_presigned_url(f"FoodImages/{food['name'].lower().replace(' ', '_')}.png")
     return FoodItemModel(**food, image_uri=uri)
 
 
@@ -385,5 +385,5 @@ async def get_food_image(
     ),
 ):
     food = await _get_or_404(foods_collection, food_id, "Food item")
-    uri = await s3.get_presigned_url(f"FoodImages/{food['name'].lower().replace(' ', '_')}.png")
+    uri = s3.get_presigned_url(f"FoodImages/{food['name'].lower().replace(' ', '_')}.png")
     return ServerMessage(detail=uri)
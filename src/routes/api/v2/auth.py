@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
 from typing import Any, Literal, TypedDict
 
@@ -7,6 +8,7 @@ import arrow
 import httpx
 import jwt
 import jwt.algorithms
+import orjson
 import pymongo
 from cryptography.hazmat.primitives.asymmetric import rsa
 from dotenv import load_dotenv
@@ -39,6 +41,7 @@ from src.utils.token_manager import TokenManager, TokenPairDict
 router: APIRouter = APIRouter(prefix="/auth", tags=["Authentication"])
 
 auth_manager: TokenManager = app.state.auth_manager
+http_client: httpx.AsyncClient = app.state.http_client
 database: Database = app.state.mongo_database
 redis_client: Redis = app.state.redis_client
 email_normalizer: EmailNormalizer = app.state.email_normalizer
@@ -76,22 +79,34 @@ class ApplePublicKeysResponse(TypedDict):
     keys: list[ApplePublicKey]
 
 
+_apple_keys_inflight: dict[str, asyncio.Task[ApplePublicKeysResponse]] = {}
+
+
 async def _fetch_apple_public_keys() -> ApplePublicKeysResponse:
-    async with httpx.AsyncClient() as client:
-        response = await client.get(APPLE_KEYS_URL)
-        response.raise_for_status()
-        return response.json()
+    response = await http_client.get(APPLE_KEYS_URL)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def _refresh_apple_public_keys(redis_client: Redis, cache_key: str) -> ApplePublicKeysResponse:
+    keys = await _fetch_apple_public_keys()
+    await redis_client.set(cache_key, orjson.dumps(keys), ex=6 * 60 * 60)
+    return keys
 
 
 async def fetch_apple_public_keys(redis_client: Redis) -> ApplePublicKeysResponse:
     cache_key = "apple_public_keys"
     cached_keys = await redis_client.get(cache_key)
     if cached_keys:
-        return httpx.Response(200, content=cached_keys).json()
+        return orjson.loads(cached_keys)
 
-    keys = await _fetch_apple_public_keys()
-    await redis_client.set(cache_key, httpx.Response(200, json=keys).content, ex=6 * 60 * 60)
-    return keys
+    if cache_key in _apple_keys_inflight:
+        return await asyncio.shield(_apple_keys_inflight[cache_key])
+
+    task = asyncio.create_task(_refresh_apple_public_keys(redis_client, cache_key))
+    _apple_keys_inflight[cache_key] = task
+    task.add_done_callback(lambda _: _apple_keys_inflight.pop(cache_key, None))
+    return await asyncio.shield(task)
 
 
 async def verify_apple_id_token(id_token: str, redis_client: Redis) -> dict[str, Any]:
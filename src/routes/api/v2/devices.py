@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 import arrow
 from fastapi import APIRouter, Body, Depends
 from pydantic import BaseModel
@@ -85,7 +87,7 @@ async def unregister_device_token(user_id: str = Depends(get_user_id, use_cache=
 async def receive_daily_metrics(data: dict = Body(..., embed=False), user_id: str = Depends(get_user_id, use_cache=False)) -> bool:
     timestamp = arrow.now().int_timestamp
 
-    await redis_client.set(f"daily_metrics:{user_id}:{timestamp}", str(data))
+    await redis_client.set(f"daily_metrics:{user_id}:{timestamp}", json.dumps(data))
     return True
 
 
@@ -110,5 +112,5 @@ async def receive_diagnostic_metrics(
 ) -> bool:
     timestamp = arrow.now().int_timestamp
 
-    await redis_client.set(f"diagnostic_metrics:{user_id}:{timestamp}", str(data))
+    await redis_client.set(f"diagnostic_metrics:{user_id}:{timestamp}", json.dumps(data))
     return True
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import os
 import threading
 import time
+from pathlib import Path
 from string import Template
 from typing import Any, TypedDict, TypeVar
 
+import orjson
 from dotenv import load_dotenv
 from google import genai
-from google.genai.types import Content, GenerateContentConfig, Part
+from google.genai.types import (
+    Content,
+    GenerateContentConfig,
+    GenerateContentResponse,
+    Part,
+)
 from pydantic import BaseModel, Field
 
 from src.models import ExerciseModel, PartialMyPlanModel
@@ -17,6 +24,8 @@ from src.models import UserDict as User
 
 load_dotenv()
 
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+
 
 class ExercisesModel(BaseModel):
     exercises: list[ExerciseModel]
@@ -41,12 +50,37 @@ class PromptsDict(TypedDict):
     plan_prompt: Data
 
 
-with open("src/utils/prompts.json", "r") as f:
-    PROMPTS: PromptsDict = json.load(f)
+PROMPTS: PromptsDict = orjson.loads(Path("src/utils/prompts.json").read_bytes())
+
+TIPS_SYSTEM_PROMPT = PROMPTS["tips_prompt"]["system"]
+TIPS_USER_TEMPLATES = tuple(Template(part) for part in PROMPTS["tips_prompt"]["user"])
+
+EXERCISE_SYSTEM_TEMPLATE = Template(PROMPTS["exercise_prompt"]["system"])
+EXERCISE_USER_TEMPLATES = tuple(Template(part) for part in PROMPTS["exercise_prompt"]["user"])
+
+PLAN_SYSTEM_PROMPT = PROMPTS["plan_prompt"]["system"]
+PLAN_USER_TEMPLATES = tuple(Template(part) for part in PROMPTS["plan_prompt"]["user"])
 
 ModelT = TypeVar("ModelT", bound=BaseModel)
 
 
+def _dump(obj: Any) -> str:
+    return orjson.dumps(obj, default=str).decode()
+
+
+def _json_config(system_prompt: str, response_schema: type[BaseModel]) -> GenerateContentConfig:
+    return GenerateContentConfig(
+        system_instruction=system_prompt,
+        response_mime_type="application/json",
+        response_schema=response_schema,
+        tools=[],
+    )
+
+
+TIPS_CONFIG = _json_config(TIPS_SYSTEM_PROMPT, DailyInsightModel)
+PLAN_CONFIG = _json_config(PLAN_SYSTEM_PROMPT, PartialMyPlanModel)
+
+
 class GoogleAPIHandler:
     def __init__(self):
         key_seperator = os.environ["GEMINI_API_KEY_SEPERATOR"]
@@ -55,86 +89,86 @@ class GoogleAPIHandler:
         if not self.__keys:
             raise ValueError("No GEMINI API keys provided")
 
+        self.__clients = [genai.Client(api_key=key) for key in self.__keys]
         self.__index = 0
         self.__lock = threading.Lock()
 
         self.model = "gemini-2.5-flash"
 
-    def _next_key(self) -> str:
+    def _next_client(self) -> genai.Client:
         with self.__lock:
-            key = self.__keys[self.__index]
-            self.__index = (self.__index + 1) % len(self.__keys)
-            return key
+            client = self.__clients[self.__index]
+            self.__index = (self.__index + 1) % len(self.__clients)
+            return client
+
+    async def close(self) -> None:
+        for client in self.__clients:
+            await client.aio.aclose()
+
+    async def _generate_content(self, content: Content, config: GenerateContentConfig) -> GenerateContentResponse:
+        client = self._next_client()
+        return await asyncio.wait_for(
+            client.aio.models.generate_content(
+                model=self.model,
+                contents=[content],
+                config=config,
+            ),
+            timeout=GEMINI_TIMEOUT_SECONDS,
+        )
 
     async def _generate_response(
         self,
         *,
-        system_prompt: str,
+        config: GenerateContentConfig,
         user_prompt: list[str],
         response_schema: type[ModelT],
     ) -> ModelT:
-        client = genai.Client(api_key=self._next_key())
         content = Content(parts=[Part.from_text(text=part) for part in user_prompt])
-        config = GenerateContentConfig(
-            system_instruction=system_prompt,
-            response_mime_type="application/json",
-            response_schema=response_schema,
-            tools=[],
-        )
-        model = self.model
-        response = await client.aio.models.generate_content(
-            model=model,
-            contents=[content],
-            config=config,
-        )
+        try:
+            response = await self._generate_content(content, config)
+        except asyncio.TimeoutError:
+            # Retry once on the next key before giving up
+            response = await self._generate_content(content, config)
+
         if response.text:
-            return response_schema(**json.loads(response.text))
+            return response_schema.model_validate_json(response.text)
 
         return response_schema()
 
     async def generate_tips(self, user: User):
-        system_prompt = PROMPTS["tips_prompt"]["system"]
-        user_prompt = PROMPTS["tips_prompt"]["user"]
-
-        user_prompt = [Template(part).safe_substitute(user=user, todays_timestamp=time.time()) for part in user_prompt]
+        user_data, now = _dump(user), time.time()
+        user_prompt = [template.safe_substitute(user=user_data, todays_timestamp=now) for template in TIPS_USER_TEMPLATES]
 
         tips = await self._generate_response(
-            system_prompt=system_prompt,
+            config=TIPS_CONFIG,
             user_prompt=user_prompt,
             response_schema=DailyInsightModel,
         )
         return tips
 
     async def generate_exercises(self, user: User, exercise_sets: list[dict]):
-        system_prompt = PROMPTS["exercise_prompt"]["system"]
-        user_prompt = PROMPTS["exercise_prompt"]["user"]
-
-        user_prompt = [Template(part).safe_substitute(user=user, todays_timestamp=time.time()) for part in user_prompt]
-        system_prompt = Template(system_prompt).safe_substitute(exercise_sets=exercise_sets)
+        user_data, now = _dump(user), time.time()
+        user_prompt = [template.safe_substitute(user=user_data, todays_timestamp=now) for template in EXERCISE_USER_TEMPLATES]
+        system_prompt = EXERCISE_SYSTEM_TEMPLATE.safe_substitute(exercise_sets=_dump(exercise_sets))
 
         routine = await self._generate_response(
-            system_prompt=system_prompt,
+            config=_json_config(system_prompt, ExercisesModel),
             user_prompt=user_prompt,
             response_schema=ExercisesModel,
         )
         return routine
 
     async def generate_plan(self, user: User, available_foods: list[dict[str, Any]]):
-        system_prompt = PROMPTS["plan_prompt"]["system"]
-        user_prompt = PROMPTS["plan_prompt"]["user"]
-
-        user_prompt = [
-            Template(part).safe_substitute(
-                user=user,
-                todays_timestamp=time.time(),
-                available_food_items=available_foods,
-                past_meal_plans=[],
-            )  # TODO: pass in past meal plans
-            for part in user_prompt
-        ]
+        substitutions = {
+            "user": _dump(user),
+            "todays_timestamp": time.time(),
+            "available_food_items": _dump(available_foods),
+            "past_meal_plans": "[]",  # TODO: pass in past meal plans
+        }
+        user_prompt = [template.safe_substitute(substitutions) for template in PLAN_USER_TEMPLATES]
 
         generated = await self._generate_response(
-            system_prompt=system_prompt,
+            config=PLAN_CONFIG,
             user_prompt=user_prompt,
             response_schema=PartialMyPlanModel,
         )
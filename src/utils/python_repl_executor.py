@@ -15,6 +15,8 @@ class ExecutionResult(typing.TypedDict):
 class PythonReplExecutor:
     """Execute Python code safely through a web interface."""
 
+    MAX_STREAM_BYTES = 1024 * 1024
+
     def __init__(self):
         self.global_scope = Scope({})
 
@@ -22,21 +24,44 @@ class PythonReplExecutor:
         """Create a new scope with given variables."""
         return Scope(kwargs)
 
+    async def _outputs(self, raw_code: str, *, scope: Scope) -> typing.AsyncIterator[str]:
+        """Run code in the shared scope and yield each non-None result as text; errors propagate."""
+        self.global_scope.update(scope)
+
+        async for x in AsyncCodeExecutor(raw_code, scope=self.global_scope, auto_return=True):
+            if x is not None:
+                yield str(x)
+
     async def execute(self, raw_code: str, *, scope: Scope) -> ExecutionResult:
         """Execute Python code safely."""
-        result = ""
-
-        self.global_scope.update(scope)
+        parts: list[str] = []
 
         try:
-            async for x in AsyncCodeExecutor(raw_code, scope=self.global_scope, auto_return=True):
-                if x is not None:
-                    result += str(x) + "\n"
+            async for output in self._outputs(raw_code, scope=scope):
+                parts.append(output)
 
         except Exception as e:
             return ExecutionResult(success=False, result=None, error=str(e), command=raw_code)
 
-        return ExecutionResult(success=True, result=result.strip() or "(no output)", error=None, command=raw_code)
+        result = "\n".join(parts).strip()
+        return ExecutionResult(success=True, result=result or "(no output)", error=None, command=raw_code)
+
+    async def stream(self, raw_code: str, *, scope: Scope) -> typing.AsyncIterator[str]:
+        """Execute Python code and yield each output as it is produced, up to MAX_STREAM_BYTES."""
+        total_bytes = 0
+
+        try:
+            async for output in self._outputs(raw_code, scope=scope):
+                chunk = f"{output}\n"
+                total_bytes += len(chunk.encode("utf-8", errors="replace"))
+                if total_bytes > self.MAX_STREAM_BYTES:
+                    yield "... (output truncated - limit reached)\n"
+                    return
+
+                yield chunk
+
+        except Exception as e:
+            yield f"Error: {e}\n"
 
     def reset_scope(self):
         """Reset the REPL scope."""
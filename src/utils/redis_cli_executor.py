@@ -1,10 +1,36 @@
 from __future__ import annotations
 
 import inspect
-from typing import Any, TypedDict
+from typing import Any, Callable, TypedDict, cast
 
 from redis.asyncio import Redis
 
+_ALLOWED = 0
+_FORBIDDEN = 1
+_UNKNOWN = 2
+
+
+def _decode(value: Any) -> str:
+    return value.decode("utf-8", errors="replace") if type(value) is bytes else str(value)
+
+
+def _format_list(result: list[Any]) -> str:
+    if not result:
+        return "(empty list)"
+    return "\n".join(f"{i}) {_decode(item)}" for i, item in enumerate(result, 1))
+
+
+def _format_dict(result: dict[Any, Any]) -> str:
+    return "\n".join(f"{_decode(key)}: {_decode(value)}" for key, value in result.items())
+
+
+_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    type(None): lambda _: "(nil)",
+    bytes: _decode,
+    list: _format_list,
+    dict: _format_dict,
+}
+
 
 class CommandResult(TypedDict):
     success: bool
@@ -72,31 +98,37 @@ class RedisCliExecutor:
         "migrate",
     }
 
+    _CMD_TABLE: dict[str, int] = dict.fromkeys(ALLOWED_COMMANDS, _ALLOWED) | dict.fromkeys(FORBIDDEN_COMMANDS, _FORBIDDEN)
+
     def __init__(self, redis_client: Redis):
         self.redis_client = redis_client
+        self._execute = redis_client.execute_command
+        self._is_coro = inspect.iscoroutinefunction(self._execute)
 
-    async def execute_command(self, command: str) -> CommandResult:
-        try:
-            parts = command.strip().split()
-            if not parts:
-                return CommandResult(success=False, result=None, error="No command provided", command=command)
+    def _parse_command(self, command: str) -> tuple[str, list[str]]:
+        parts = command.split(None, 1)
+        if not parts:
+            raise ValueError("No command provided")
+
+        cmd = parts[0].lower()
+        status = self._CMD_TABLE.get(cmd, _UNKNOWN)
 
-            cmd = parts[0].lower()
-            args = parts[1:]
+        if status == _FORBIDDEN:
+            raise ValueError(f"Command '{cmd}' is forbidden for security reasons")
 
-            if cmd in self.FORBIDDEN_COMMANDS:
-                return CommandResult(
-                    success=False, result=None, error=f"Command '{cmd}' is forbidden for security reasons", command=command
-                )
+        if status == _UNKNOWN:
+            raise ValueError(f"Command '{cmd}' is not in the allowed list")
 
-            if cmd not in self.ALLOWED_COMMANDS:
-                return CommandResult(success=False, result=None, error=f"Command '{cmd}' is not in the allowed list", command=command)
+        return cmd, parts[1].split() if len(parts) > 1 else []
+
+    async def execute_command(self, command: str) -> CommandResult:
+        try:
+            cmd, args = self._parse_command(command)
 
-            execute_command_method = self.redis_client.execute_command
-            if not inspect.iscoroutinefunction(execute_command_method):
-                result = execute_command_method(cmd, *args)
+            if self._is_coro:
+                result = await self._execute(cmd, *args)
             else:
-                result = await self.redis_client.execute_command(cmd, *args)
+                result = self._execute(cmd, *args)
 
             formatted_result = self._format_result(result)
 
@@ -105,33 +137,38 @@ class RedisCliExecutor:
         except Exception as e:
             return CommandResult(success=False, result=None, error=str(e), command=command)
 
-    def _format_result(self, result: Any) -> str:
-        if result is None:
-            return "(nil)"
-
-        if isinstance(result, bytes):
-            return result.decode("utf-8", errors="replace")
-
-        if isinstance(result, list):
-            if not result:
-                return "(empty list)"
-            formatted = []
-            for i, item in enumerate(result, 1):
-                if isinstance(item, bytes):
-                    formatted.append(f"{i}) {item.decode('utf-8', errors='replace')}")
+    async def execute_many(self, commands: list[str]) -> list[CommandResult]:
+        """Run several commands in one pipelined round trip; rejected commands are reported in place."""
+        results: list[CommandResult | None] = [None] * len(commands)
+        queued: list[tuple[int, str]] = []
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for index, command in enumerate(commands):
+            try:
+                cmd, args = self._parse_command(command)
+            except ValueError as e:
+                results[index] = CommandResult(success=False, result=None, error=str(e), command=command)
+                continue
+
+            pipe.execute_command(cmd, *args)
+            queued.append((index, command))
+
+        if queued:
+            try:
+                responses = await pipe.execute(raise_on_error=False)
+            except Exception as e:
+                responses = [e] * len(queued)
+
+            for (index, command), response in zip(queued, responses):
+                if isinstance(response, Exception):
+                    results[index] = CommandResult(success=False, result=None, error=str(response), command=command)
                 else:
-                    formatted.append(f"{i}) {item}")
-            return "\n".join(formatted)
-
-        if isinstance(result, dict):
-            formatted = []
-            for key, value in result.items():
-                k = key.decode("utf-8") if isinstance(key, bytes) else str(key)
-                v = value.decode("utf-8") if isinstance(value, bytes) else str(value)
-                formatted.append(f"{k}: {v}")
-            return "\n".join(formatted)
-
-        return str(result)
+                    results[index] = CommandResult(success=True, result=self._format_result(response), error=None, command=command)
+
+        return cast(list[CommandResult], results)
+
+    def _format_result(self, result: Any) -> str:
+        return _FORMATTERS.get(type(result), str)(result)
 
     def get_allowed_commands(self) -> list[str]:
         return sorted(list(self.ALLOWED_COMMANDS))
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import time
 from contextlib import AsyncExitStack
-from typing import cast
+from typing import Any, cast
 
+import boto3
 from aiobotocore.config import AioConfig
 from aiobotocore.session import AioSession, get_session
+from botocore.config import Config
 from dotenv import load_dotenv
 from types_aiobotocore_s3.client import S3Client
 
@@ -17,6 +21,10 @@ AWS_SECRET_KEY = os.environ["AWS_SECRET_KEY"]
 BUCKET_NAME = os.environ["AWS_BUCKET_NAME"]
 REGION = os.environ["AWS_REGION"]
 
+PRESIGNED_URL_EXPIRY = 1 * 60 * 60  # 1 hour
+# Reuse a generated URL while it still has at least 45 minutes left to live.
+PRESIGNED_URL_CACHE_TTL = 15 * 60
+
 
 class Manager:
     def __init__(self):
@@ -47,31 +55,77 @@ async def create_s3_client(session: AioSession, exit_stack: AsyncExitStack) -> S
     return cast(S3Client, client)
 
 
+def create_s3_signer() -> Any:
+    """Synchronous client used only for presigning, which is local HMAC work with no network call."""
+    return boto3.client(
+        "s3",
+        region_name=REGION,
+        aws_secret_access_key=AWS_SECRET_KEY,
+        aws_access_key_id=AWS_ACCESS_KEY,
+        config=Config(
+            signature_version="s3v4",
+            s3={"addressing_style": "virtual"},
+        ),
+    )
+
+
 class S3:
     def __init__(self):
         self.bucket_name: str = BUCKET_NAME
 
         self.session = get_session()
+        self._presigned_urls: dict[str, tuple[str, float]] = {}
+        self._signer = create_s3_signer()
 
-    async def get_presigned_url(self, file_name: str) -> str:
-        async with AsyncExitStack() as stack:
-            s3_client = await create_s3_client(self.session, stack)
-            response = await s3_client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": self.bucket_name, "Key": file_name},
-                ExpiresIn=1 * 60 * 60,  # 1 hour
-            )
-            return response
+        self._exit_stack = AsyncExitStack()
+        self._client: S3Client | None = None
+        self._client_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> S3:
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _get_client(self) -> S3Client:
+        if self._client is not None:
+            return self._client
+
+        async with self._client_lock:
+            if self._client is None:
+                self._client = await create_s3_client(self.session, self._exit_stack)
+            return self._client
+
+    async def close(self) -> None:
+        async with self._client_lock:
+            self._client = None
+            await self._exit_stack.aclose()
+
+    def get_presigned_url(self, file_name: str) -> str:
+        now = time.monotonic()
+        cached = self._presigned_urls.get(file_name)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        response: str = self._signer.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket_name, "Key": file_name},
+            ExpiresIn=PRESIGNED_URL_EXPIRY,
+        )
+
+        self._presigned_urls[file_name] = (response, now + PRESIGNED_URL_CACHE_TTL)
+        return response
 
     async def _list_s3_items(self, prefix: str, key: str) -> list[str]:
-        async with AsyncExitStack() as stack:
-            s3_client = await create_s3_client(self.session, stack)
-            response = await s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix,
-                Delimiter="/",
-            )
-            return [item[key] for item in response.get(key == "Key" and "Contents" or "CommonPrefixes", [])]
+        s3_client = await self._get_client()
+        response = await s3_client.list_objects_v2(
+            Bucket=self.bucket_name,
+            Prefix=prefix,
+            Delimiter="/",
+        )
+        container = "Contents" if key == "Key" else "CommonPrefixes"
+        return [item[key] for item in response.get(container, [])]
 
     async def list_files(self, prefix: str) -> list[str]:
         return await self._list_s3_items(prefix, "Key")
@@ -80,10 +134,9 @@ class S3:
         return await self._list_s3_items(prefix, "Prefix")
 
     async def get_metadata(self, file_name: str):
-        async with AsyncExitStack() as stack:
-            s3_client = await create_s3_client(self.session, stack)
-            response = await s3_client.head_object(
-                Bucket=self.bucket_name,
-                Key=file_name,
-            )
-            return response
+        s3_client = await self._get_client()
+        response = await s3_client.head_object(
+            Bucket=self.bucket_name,
+            Key=file_name,
+        )
+        return response
@@ -1,8 +1,40 @@
 from __future__ import annotations
 
 import asyncio
-import shlex
-from typing import AsyncIterator, TypedDict
+import os
+import re
+import signal
+from typing import AsyncIterator, NotRequired, TypedDict
+
+# One shell word: runs of plain characters, backslash escapes and quoted sections with no
+# separating whitespace. Anything else left over (a stray quote or trailing backslash) is an error.
+_TOKEN_RE = re.compile(r"""(?:[^ \t\r\n'"\\]+|\\.|'[^']*'|"(?:[^"\\]|\\.)*")+|(\S)""", re.S)
+_PART_RE = re.compile(r"""([^'"\\]+)|\\(.)|'([^']*)'|"((?:[^"\\]|\\.)*)["]""", re.S)
+_DQUOTE_ESCAPE_RE = re.compile(r'\\([\\"])')
+
+_TRUNCATED_MESSAGE = "... (output truncated - limit reached)"
+
+
+def _unquote(part: re.Match[str]) -> str:
+    plain, escaped, single, double = part.groups()
+    if double is not None:
+        return _DQUOTE_ESCAPE_RE.sub(r"\1", double)
+    return plain or escaped or single or ""
+
+
+def split_command(command: str) -> list[str]:
+    """Split a command line into words with POSIX shell quoting, matching ``shlex.split``."""
+    words = []
+    for token in _TOKEN_RE.finditer(command):
+        stray = token.group(1)
+        if stray is not None:
+            # Like shlex, a dangling escape at end of input wins over the open quote it sits in
+            end = token.end()
+            rest = command[end:]
+            dangling_escape = stray == '"' and (len(rest) - len(rest.rstrip("\\"))) % 2 == 1
+            raise ValueError("No closing quotation" if stray in "'\"" and not dangling_escape else "No escaped character")
+        words.append("".join(_unquote(part) for part in _PART_RE.finditer(token.group())))
+    return words
 
 
 class CommandOutput(TypedDict):
@@ -14,6 +46,7 @@ class CommandOutput(TypedDict):
 class StreamOutput(TypedDict):
     type: str
     data: str
+    truncated: NotRequired[bool]
 
 
 class TerminalExecutor:
@@ -21,27 +54,80 @@ class TerminalExecutor:
 
     MAX_OUTPUT_LENGTH = 10000
     TIMEOUT_SECONDS = 30
+    READ_CHUNK_SIZE = 4096
 
     async def read_stream(self, stream: asyncio.StreamReader, stream_type: str) -> AsyncIterator[StreamOutput]:
-        """Read from stdout or stderr and yield lines."""
+        """Read from stdout or stderr in chunks and yield complete lines."""
+        buffer = bytearray()
         total_bytes = 0
         while True:
-            line = await stream.readline()
-            if not line:
+            chunk = await stream.read(self.READ_CHUNK_SIZE)
+            if not chunk:
                 break
 
-            decoded_line = line.decode("utf-8", errors="replace").rstrip()
-            total_bytes += len(line)
+            # Keep whatever still fits under the cap from the chunk that crosses it
+            room = self.MAX_OUTPUT_LENGTH - total_bytes
+            total_bytes += len(chunk)
+            truncated = total_bytes > self.MAX_OUTPUT_LENGTH
+            buffer += chunk[:room] if truncated else chunk
+            *lines, rest = buffer.split(b"\n")
+            buffer = bytearray(rest)
+
+            for line in lines:
+                yield StreamOutput(type=stream_type, data=line.decode("utf-8", errors="replace").rstrip())
+
+            if truncated:
+                yield StreamOutput(type=stream_type, data=_TRUNCATED_MESSAGE, truncated=True)
+                # Discard the rest until EOF so the pipe is closed once the command has been killed
+                while await stream.read(self.READ_CHUNK_SIZE):
+                    pass
+                return
+
+        if buffer:
+            yield StreamOutput(type=stream_type, data=buffer.decode("utf-8", errors="replace").rstrip())
+
+    async def _drain_stream(self, stream: asyncio.StreamReader, stream_type: str, queue: asyncio.Queue[StreamOutput | None]) -> None:
+        """Forward lines from one stream into the shared queue, then signal EOF with None."""
+        try:
+            async for item in self.read_stream(stream, stream_type):
+                queue.put_nowait(item)
+        finally:
+            queue.put_nowait(None)
+
+    async def _merge_output(self, process: asyncio.subprocess.Process, deadline: float) -> AsyncIterator[StreamOutput]:
+        """Yield stdout and stderr lines in arrival order; raises TimeoutError once the deadline passes."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[StreamOutput | None] = asyncio.Queue()
+        readers = [
+            asyncio.create_task(self._drain_stream(stream, stream_type, queue))
+            for stream, stream_type in ((process.stdout, "stdout"), (process.stderr, "stderr"))
+            if stream
+        ]
 
-            if total_bytes > self.MAX_OUTPUT_LENGTH:
-                yield StreamOutput(type=stream_type, data="... (output truncated - limit reached)")
-                break
+        try:
+            pending = len(readers)
+            while pending:
+                item = await asyncio.wait_for(queue.get(), timeout=deadline - loop.time())
+                if item is None:
+                    pending -= 1
+                    continue
 
-            yield StreamOutput(type=stream_type, data=decoded_line)
+                yield item
+        finally:
+            for reader in readers:
+                reader.cancel()
+
+    def _kill_process_group(self, process: asyncio.subprocess.Process) -> bool:
+        """Kill the command and everything it spawned; False if the group is already gone."""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            return False
+        return True
 
     async def execute_command_stream(self, command: str) -> AsyncIterator[CommandOutput]:
         """Execute command and stream output line by line."""
-        parts = shlex.split(command.strip())
+        parts = split_command(command.strip())
         if not parts:
             yield CommandOutput(type="error", data="No command provided", exit_code=None)
             return
@@ -52,29 +138,30 @@ class TerminalExecutor:
             *parts,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            # Own process group, so shell-wrapped or piped commands can be killed as a whole
+            start_new_session=True,
         )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.TIMEOUT_SECONDS
 
-        # Read stdout and stderr concurrently
-        tasks = []
-        if process.stdout:
-            tasks.append(self.read_stream(process.stdout, "stdout"))
-        if process.stderr:
-            tasks.append(self.read_stream(process.stderr, "stderr"))
-
-        # Yield output as it comes
-        for task in tasks:
-            async for item in task:
+        stopped_at_limit = False
+        try:
+            async for item in self._merge_output(process, deadline):
                 yield item
+                if item.get("truncated"):
+                    # Nothing more will be read, so stop the command instead of letting it block on a full pipe
+                    stopped_at_limit = self._kill_process_group(process)
 
-        # Wait for process to complete
-        try:
-            await asyncio.wait_for(process.wait(), timeout=self.TIMEOUT_SECONDS)
+            await asyncio.wait_for(process.wait(), timeout=max(deadline - loop.time(), 0))
         except asyncio.TimeoutError:
-            process.kill()
+            self._kill_process_group(process)
+            await process.wait()
             yield CommandOutput(type="error", data="Command execution timed out", exit_code=None)
             return
 
-        if process.returncode == 0:
+        if stopped_at_limit and process.returncode != 0:
+            yield CommandOutput(type="end", data="Command output truncated - process stopped at the limit", exit_code=None)
+        elif process.returncode == 0:
             yield CommandOutput(type="end", data="Command completed successfully", exit_code=0)
         else:
             yield CommandOutput(type="end", data=f"Command failed with exit code {process.returncode}", exit_code=process.returncode)
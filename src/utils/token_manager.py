@@ -1,49 +1,77 @@
 from __future__ import annotations
 
+import hmac
 import os
-import uuid
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Any, Literal, Mapping, TypedDict, overload
+from datetime import timedelta
+from typing import Any, Generic, Literal, TypedDict, TypeVar, cast
 
-import jwt
+import orjson
 from dotenv import load_dotenv
-from redis.asyncio import Redis
+from jwt.utils import base64url_decode, base64url_encode
+from redis.asyncio import BlockingConnectionPool, Redis
 
 _ = load_dotenv(verbose=True)
 
 JWT_SECRET = os.environ["JWT_SECRET_KEY"]
 JWT_ALGO = os.environ["JWT_ALGORITHM"]
 
+# Digest names (rather than constructors) let hmac.digest take OpenSSL's one-shot HMAC path.
+_HMAC_DIGESTS = {"HS256": "sha256", "HS384": "sha384", "HS512": "sha512"}
+
+# The same secret signs and verifies, so only the HMAC algorithms can work here.
+if JWT_ALGO not in _HMAC_DIGESTS:
+    raise ValueError(f"Unsupported JWT_ALGORITHM {JWT_ALGO!r}, expected one of {', '.join(_HMAC_DIGESTS)}")
+
+_JWT_SECRET_BYTES = JWT_SECRET.encode()
+_JWT_DIGEST = _HMAC_DIGESTS[JWT_ALGO]
+_JWT_HEADER_SEGMENT = base64url_encode(orjson.dumps({"alg": JWT_ALGO, "typ": "JWT"}))
+
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB", "10"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
 
 ACCESS_EXP = timedelta(minutes=60)
 REFRESH_EXP = timedelta(days=7)
 
+ACCESS_TTL_SECONDS = int(ACCESS_EXP.total_seconds())
+REFRESH_TTL_SECONDS = int(REFRESH_EXP.total_seconds())
+
 JWT_LEEWAY_SECONDS = int(os.getenv("JWT_LEEWAY_SECONDS", "30"))
 
+# Verified access tokens are reused for at most this long (and never past their exp).
+DECODE_CACHE_TTL_SECONDS = 60
+DECODE_CACHE_MAXSIZE = 10_000
+# Refresh jtis this process has seen revoked, so replays are rejected without a Redis round trip.
+REVOKED_CACHE_MAXSIZE = 10_000
+
 ISSUER = "server"
 AUDIENCE = "individuals"
 
+_REQUIRED_CLAIMS = ("exp", "iat", "iss", "aud", "sub", "type")
+
 
 class BasePayload(TypedDict):
     sub: str
     iss: str
     aud: str
-    iat: datetime
+    iat: int
 
 
 class AccessPayload(BasePayload):
     type: Literal["access"]
-    exp: datetime
+    exp: int
 
 
 class RefreshPayload(BasePayload):
     type: Literal["refresh"]
     jti: str
-    exp: datetime
+    exp: int
 
 
 class DecodedBasePayload(TypedDict):
@@ -88,50 +116,160 @@ class RedisKeys:
 
 _KEYS = RedisKeys()
 
+# Rotate a refresh session only if the old one still exists and belongs to the caller, so failed
+# refreshes stay read-only. Returns 1 on rotation, 0 if the session is gone, -1 on an owner mismatch.
+# KEYS: old session, new session, user's session set. ARGV: user id, old jti, new jti, ttl.
+_ROTATE_REFRESH_SCRIPT = """
+local stored = redis.call("GET", KEYS[1])
+if not stored then
+    return 0
+end
+if stored ~= ARGV[1] then
+    return -1
+end
+redis.call("DEL", KEYS[1])
+redis.call("SREM", KEYS[3], ARGV[2])
+redis.call("SETEX", KEYS[2], ARGV[4], ARGV[1])
+redis.call("SADD", KEYS[3], ARGV[3])
+redis.call("EXPIRE", KEYS[3], ARGV[4])
+return 1
+"""
+
+
+_V = TypeVar("_V")
+
+
+class _TTLCache(Generic[_V]):
+    def __init__(self, maxsize: int, /):
+        self.maxsize = maxsize
+        self._items: OrderedDict[str, tuple[_V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, /) -> _V | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if item[1] <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def set(self, key: str, value: _V, ttl: float, /) -> None:
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + ttl)
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+
+def _encode(payload: AccessPayload | RefreshPayload) -> str:
+    # The header never changes, so only the claims segment and the signature are computed per token
+    signing_input = _JWT_HEADER_SEGMENT + b"." + base64url_encode(orjson.dumps(payload))
+    signature = hmac.digest(_JWT_SECRET_BYTES, signing_input, _JWT_DIGEST)
+    return (signing_input + b"." + base64url_encode(signature)).decode()
+
+
+def _is_numeric(value: object, /) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_claims(payload: dict[str, Any], now: float, /) -> None:
+    if payload["iss"] != ISSUER:
+        raise AuthError("Invalid token")
+
+    aud = payload["aud"]
+    if aud != AUDIENCE and not (isinstance(aud, list) and AUDIENCE in aud):
+        raise AuthError("Invalid token")
+
+    if not isinstance(payload["sub"], str):
+        raise AuthError("Invalid token")
+
+    if payload["iat"] > now + JWT_LEEWAY_SECONDS:
+        raise AuthError("Invalid token")
+
+    nbf = payload.get("nbf")
+    if nbf is not None and (not _is_numeric(nbf) or nbf > now + JWT_LEEWAY_SECONDS):
+        raise AuthError("Invalid token")
+
+
+def _verify(token: str, /) -> dict[str, Any]:
+    # Every token we accept was minted by _encode, so the header must match ours byte for byte;
+    # that pins the algorithm without parsing it.
+    parts = token.encode().split(b".")
+    if len(parts) != 3 or parts[0] != _JWT_HEADER_SEGMENT:
+        raise AuthError("Invalid token")
+
+    try:
+        payload = orjson.loads(base64url_decode(parts[1]))
+        signature = base64url_decode(parts[2])
+    except ValueError:
+        raise AuthError("Invalid token")
+
+    if not isinstance(payload, dict) or any(claim not in payload for claim in _REQUIRED_CLAIMS):
+        raise AuthError("Invalid token")
+
+    exp, iat = payload["exp"], payload["iat"]
+    if not _is_numeric(exp) or not _is_numeric(iat):
+        raise AuthError("Invalid token")
+
+    # Expired tokens are rejected before spending an HMAC on them; rejecting is the only outcome either way.
+    now = time.time()
+    if exp <= now - JWT_LEEWAY_SECONDS:
+        raise AuthError("Token expired")
+
+    expected = hmac.digest(_JWT_SECRET_BYTES, parts[0] + b"." + parts[1], _JWT_DIGEST)
+    if not hmac.compare_digest(expected, signature):
+        raise AuthError("Invalid token")
+
+    _check_claims(payload, now)
+    return payload
+
 
 class TokenManager:
     def __init__(self):
-        self.redis_client = Redis(
+        # Keepalive and periodic health checks stop idle pooled connections from going stale between auth bursts
+        pool = BlockingConnectionPool(
             host=REDIS_HOST,
             port=REDIS_PORT,
             db=REDIS_DB,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_keepalive=True,
+            health_check_interval=30,
             decode_responses=True,
         )
+        self.redis_client = Redis.from_pool(pool)
+        self._rotate_refresh = self.redis_client.register_script(_ROTATE_REFRESH_SCRIPT)
+        self._access_cache: _TTLCache[DecodedAccessPayload] = _TTLCache(DECODE_CACHE_MAXSIZE)
+        self._revoked_jtis: _TTLCache[bool] = _TTLCache(REVOKED_CACHE_MAXSIZE)
 
-    # ---- time helpers ----
-    def utc_now(self) -> datetime:
-        return datetime.now(timezone.utc)
-
-    def _base_payload(self, user_id: str, /) -> BasePayload:
-        return {
+    # ---- token creation ----
+    def create_access_token(self, user_id: str, now: int, /) -> str:
+        payload: AccessPayload = {
             "sub": user_id,
             "iss": ISSUER,
             "aud": AUDIENCE,
-            "iat": self.utc_now(),
-        }
-
-    # ---- token creation ----
-    def create_access_token(self, user_id: str, /) -> str:
-        base = self._base_payload(user_id)
-        payload: AccessPayload = {
-            **base,
+            "iat": now,
             "type": "access",
-            "exp": self.utc_now() + ACCESS_EXP,
+            "exp": now + ACCESS_TTL_SECONDS,
         }
-        return jwt.encode(dict(payload), JWT_SECRET, algorithm=JWT_ALGO)
+        return _encode(payload)
 
-    def create_refresh_token(self, user_id: str, jti: str, /) -> str:
-        base = self._base_payload(user_id)
+    def create_refresh_token(self, user_id: str, jti: str, now: int, /) -> str:
         payload: RefreshPayload = {
-            **base,
+            "sub": user_id,
+            "iss": ISSUER,
+            "aud": AUDIENCE,
+            "iat": now,
             "type": "refresh",
             "jti": jti,
-            "exp": self.utc_now() + REFRESH_EXP,
+            "exp": now + REFRESH_TTL_SECONDS,
         }
-        return jwt.encode(dict(payload), JWT_SECRET, algorithm=JWT_ALGO)
+        return _encode(payload)
 
     async def _store_refresh_session(self, user_id: str, jti: str, /) -> None:
-        ttl = int(REFRESH_EXP.total_seconds())
+        ttl = REFRESH_TTL_SECONDS
         refresh_key = _KEYS.refresh_jti(jti)
         set_key = _KEYS.user_refresh_set(user_id)
 
@@ -150,136 +288,88 @@ class TokenManager:
             pipe.srem(set_key, jti)
             await pipe.execute()
 
-    def _require_str(self, payload: Mapping[str, Any], key: str, /) -> str:
-        value = payload.get(key)
-        if isinstance(value, str):
-            return value
-        raise AuthError(f"Invalid token payload: '{key}' must be a string")
-
-    def _require_int(self, payload: Mapping[str, Any], key: str, /) -> int:
-        value = payload.get(key)
-        if isinstance(value, int) and not isinstance(value, bool):
-            return int(value)
-        raise AuthError(f"Invalid token payload: '{key}' must be an integer")
-
-    def _require_literal(self, payload: Mapping[str, Any], key: str, expected: str, /) -> None:
-        if payload.get(key) != expected:
-            raise AuthError(f"Invalid token payload: '{key}' must be '{expected}'")
-
-    @overload
-    def decode(self, token: str, expected_type: Literal["access"], /) -> DecodedAccessPayload: ...  # noqa: E704
-    @overload
-    def decode(self, token: str, expected_type: Literal["refresh"], /) -> DecodedRefreshPayload: ...  # noqa: E704
-
-    def decode(
-        self,
-        token: str,
-        expected_type: Literal["access", "refresh"],
-        /,
-    ) -> DecodedAccessPayload | DecodedRefreshPayload:
-        try:
-            decoded = jwt.decode(
-                token,
-                JWT_SECRET,
-                algorithms=[JWT_ALGO],
-                audience=AUDIENCE,
-                issuer=ISSUER,
-                leeway=JWT_LEEWAY_SECONDS,
-                options={
-                    "require": ["exp", "iat", "iss", "aud", "sub"],
-                },
-            )
-        except jwt.ExpiredSignatureError:
-            raise AuthError("Token expired")
-        except jwt.InvalidTokenError:
-            raise AuthError("Invalid token")
-
-        if not isinstance(decoded, Mapping):
-            raise AuthError("Invalid token payload")
-
-        payload = decoded
-
-        sub = self._require_str(payload, "sub")
-        iss = self._require_str(payload, "iss")
-        aud = self._require_str(payload, "aud")
-        iat = self._require_int(payload, "iat")
-
-        if expected_type == "access":
-            self._require_literal(payload, "type", "access")
-            exp = self._require_int(payload, "exp")
-            return {
-                "sub": sub,
-                "iss": iss,
-                "aud": aud,
-                "iat": iat,
-                "type": "access",
-                "exp": exp,
-            }
-
-        self._require_literal(payload, "type", "refresh")
-        jti = self._require_str(payload, "jti")
-        exp = self._require_int(payload, "exp")
-        return {
-            "sub": sub,
-            "iss": iss,
-            "aud": aud,
-            "iat": iat,
-            "type": "refresh",
-            "jti": jti,
-            "exp": exp,
-        }
+    def _remember_revoked(self, jti: str, exp: float, /) -> None:
+        # Only needed until the token would have expired on its own.
+        ttl = exp - time.time()
+        if ttl > 0:
+            self._revoked_jtis.set(jti, True, ttl)
+
+    def decode_access(self, token: str, /) -> DecodedAccessPayload:
+        cached = self._access_cache.get(token)
+        if cached is not None:
+            return cached
+
+        decoded = _verify(token)
+        if decoded["type"] != "access":
+            raise AuthError("Invalid token payload: 'type' must be 'access'")
+
+        payload = cast(DecodedAccessPayload, decoded)
+        ttl = min(DECODE_CACHE_TTL_SECONDS, payload["exp"] - time.time())
+        if ttl > 0:
+            self._access_cache.set(token, payload, ttl)
+        return payload
+
+    # Refresh tokens are not cached: they are rare, and their revocation is checked on use.
+    def decode_refresh(self, token: str, /) -> DecodedRefreshPayload:
+        decoded = _verify(token)
+        if decoded["type"] != "refresh":
+            raise AuthError("Invalid token payload: 'type' must be 'refresh'")
+        if not isinstance(decoded.get("jti"), str):
+            raise AuthError("Invalid token payload: 'jti' must be a string")
+
+        return cast(DecodedRefreshPayload, decoded)
 
     async def login(self, user_id: str, /) -> TokenPairDict:
-        jti = str(uuid.uuid4())
+        jti = secrets.token_urlsafe(16)
         await self._store_refresh_session(user_id, jti)
 
+        now = int(time.time())
         return {
-            "access_token": self.create_access_token(user_id),
-            "refresh_token": self.create_refresh_token(user_id, jti),
-            "expires_at_timestamp": int((self.utc_now() + ACCESS_EXP).timestamp()),
+            "access_token": self.create_access_token(user_id, now),
+            "refresh_token": self.create_refresh_token(user_id, jti, now),
+            "expires_at_timestamp": now + ACCESS_TTL_SECONDS,
         }
 
     def authenticate(self, access_token: str) -> str:
-        payload = self.decode(access_token, "access")
+        payload = self.decode_access(access_token)
         return payload["sub"]
 
     async def refresh(self, refresh_token: str, /) -> TokenPairDict:
-        payload = self.decode(refresh_token, "refresh")
+        payload = self.decode_refresh(refresh_token)
         user_id = payload["sub"]
         old_jti = payload["jti"]
 
-        old_key = _KEYS.refresh_jti(old_jti)
-        stored_user_id = await self.redis_client.get(old_key)
-
-        if stored_user_id is None:
+        if self._revoked_jtis.get(old_jti):
             raise AuthError("Refresh token revoked or expired (server-side session not found)")
 
-        if stored_user_id != user_id:
-            raise AuthError("Invalid refresh token (session mismatch)")
-
-        new_jti = str(uuid.uuid4())
-        ttl = int(REFRESH_EXP.total_seconds())
+        old_key = _KEYS.refresh_jti(old_jti)
+        new_jti = secrets.token_urlsafe(16)
+        ttl = REFRESH_TTL_SECONDS
         new_key = _KEYS.refresh_jti(new_jti)
         set_key = _KEYS.user_refresh_set(user_id)
 
-        async with self.redis_client.pipeline(transaction=True) as pipe:
-            pipe.delete(old_key)
-            pipe.srem(set_key, old_jti)
+        # Check ownership and rotate in one round trip (EVALSHA); failures write nothing
+        rotated = await self._rotate_refresh(keys=[old_key, new_key, set_key], args=[user_id, old_jti, new_jti, ttl])
 
-            pipe.setex(new_key, ttl, user_id)
-            pipe.sadd(set_key, new_jti)
-            pipe.expire(set_key, ttl)
-            await pipe.execute()
+        if rotated == -1:
+            raise AuthError("Invalid refresh token (session mismatch)")
 
+        self._remember_revoked(old_jti, payload["exp"])
+
+        if rotated == 0:
+            raise AuthError("Refresh token revoked or expired (server-side session not found)")
+
+        now = int(time.time())
         return {
-            "access_token": self.create_access_token(user_id),
-            "refresh_token": self.create_refresh_token(user_id, new_jti),
-            "expires_at_timestamp": int((self.utc_now() + ACCESS_EXP).timestamp()),
+            "access_token": self.create_access_token(user_id, now),
+            "refresh_token": self.create_refresh_token(user_id, new_jti, now),
+            "expires_at_timestamp": now + ACCESS_TTL_SECONDS,
         }
 
     async def logout(self, refresh_token: str, /) -> None:
-        payload = self.decode(refresh_token, "refresh")
+        payload = self.decode_refresh(refresh_token)
         await self._revoke_refresh_session(payload["sub"], payload["jti"])
+        self._remember_revoked(payload["jti"], payload["exp"])
 
     async def logout_everywhere(self, user_id: str, /) -> None:
         set_key = _KEYS.user_refresh_set(user_id)
@@ -295,3 +385,7 @@ class TokenManager:
                 pipe.delete(_KEYS.refresh_jti(jti))
             pipe.delete(set_key)
             await pipe.execute()
+
+        exp = time.time() + REFRESH_TTL_SECONDS
+        for jti in jtis:
+            self._remember_revoked(jti, exp)